@@ -64,9 +64,10 @@ def cv_conf_mat(X, y, model_obj, t, splits=3, scale_obj=None):
                                      score_funcs=scores, 
                                      splits=splits, scale_obj=scale_obj, 
                                      train_scores=False) 
-    results = [pd.concat({i: pd.DataFrame(trial[0],
-                            index=['neg_true', 'pos_true'],
-                            columns=['neg_pred', 'pos_pred'])}) 
-                   for i, trial in enumerate(results, 1)]
+    arr = np.stack([trial[0] for trial in results])
 
-    return pd.concat({t: pd.concat(results)})
\ No newline at end of file
+    idx = pd.MultiIndex.from_product([[t], range(1, len(results) + 1),
+                                      ['neg_true', 'pos_true']])
+
+    return pd.DataFrame(arr.reshape(-1, 2), index=idx,
+                        columns=['neg_pred', 'pos_pred'])
\ No newline at end of file
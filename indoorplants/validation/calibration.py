@@ -15,7 +15,7 @@ def _cv_proba(X, y, model_obj, splits=5, **cv_engine_kwargs):
     model_obj.predict = model_obj.predict_proba
 
     score = lambda true, predicted: np.hstack(
-                [true.values.reshape(-1, 1), predicted[:, 1].reshape(-1, 1)]
+                [np.asarray(true).reshape(-1, 1), predicted[:, 1].reshape(-1, 1)]
                 )
 
     return crossvalidate.cv_engine(
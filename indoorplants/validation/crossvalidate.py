@@ -1,35 +1,329 @@
-import collections
-from itertools import chain
+from collections.abc import Iterable
+from copy import deepcopy
+from functools import partial
 import pandas as pd
 import numpy as np
+from joblib import Parallel, delayed, effective_n_jobs
 from sklearn.model_selection import StratifiedKFold, KFold, \
                                     StratifiedShuffleSplit, learning_curve
-from sklearn.metrics import confusion_matrix, make_scorer
+from sklearn.metrics import make_scorer, confusion_matrix, accuracy_score, \
+                            precision_score, recall_score, f1_score
+
+try:
+    from numba import njit, prange, get_num_threads
+except ImportError:
+    njit = None
+
+
+# below this many labels, `np.bincount` beats the numba kernel's overhead
+_NUMBA_MIN_SIZE = 100000
+
+
+if njit is not None:
+
+    @njit(parallel=True, nogil=True, cache=True)
+    def _cm_binary_numba(y_true, y_pred, n_chunks):
+        """
+        Numba kernel for `_fast_binary_cm`: each of `n_chunks` threads counts 
+        a contiguous chunk of labels into its own row of a `(n_chunks, 4)` 
+        buffer, and rows are summed at the end.
+
+        Labels are not bounds-checked, so `y_true` & `y_pred` must be 1-d 
+        `np.uint8` arrays of equal length holding only 0s and 1s.
+        """
+        n = len(y_true)
+        chunk_size = (n + n_chunks - 1) // n_chunks
+
+        counts = np.zeros((n_chunks, 4), dtype=np.int64)
+        for c in prange(n_chunks):
+            for i in range(c * chunk_size, min((c + 1) * chunk_size, n)):
+                counts[c, 2 * y_true[i] + y_pred[i]] += 1
+
+        return counts.sum(axis=0).reshape(2, 2)
+
+
+def _as_binary_labels(y):
+    """
+    Returns `y` as a 1-d `np.uint8` array if it holds only 0s and 1s, else 
+    `None`. Uses range checks rather than set membership, so that integer 
+    labels are validated in a single pass.
+    """
+    y = np.asarray(y)
+
+    if y.ndim != 1:
+        return None
+
+    if y.size == 0 or y.dtype.kind == "b":
+        return y.astype(np.uint8, copy=False)
+
+    if y.dtype.kind in "iu":
+        # negative labels become very large when viewed as unsigned
+        if y.view(y.dtype.str.replace("i", "u")).max() > 1:
+            return None
+        return y.astype(np.uint8, copy=False)
+
+    if y.dtype.kind == "f":
+        if not (y.min() >= 0 and y.max() <= 1):
+            return None
+        y_int = y.astype(np.uint8)
+        return y_int if (y_int == y).all() else None
+
+    return None
+
+
+def _binary_label_pair(y_true, y_pred):
+    """
+    Returns `y_true` & `y_pred` as `np.uint8` arrays (see `_as_binary_labels`) 
+    if both are binary and of equal length, else `None`.
+    """
+    y_true, y_pred = _as_binary_labels(y_true), _as_binary_labels(y_pred)
+
+    if y_true is None or y_pred is None or len(y_true) != len(y_pred):
+        return None
+
+    return y_true, y_pred
+
+
+def _fast_binary_cm(y_true, y_pred):
+    """
+    Returns the 2x2 confusion matrix for binary (i.e. 0 or 1) `y_true` and 
+    `y_pred`, laid out as in `sklearn.metrics.confusion_matrix`. All four 
+    cells are counted in a single `np.bincount` pass (or by a parallel numba 
+    kernel for large inputs, if numba is installed), and are returned even 
+    if a class is missing from the fold.
+
+    Raises `ValueError` unless inputs are 1-d, of equal length, and 0/1.
+    """
+    labels = _binary_label_pair(y_true, y_pred)
+
+    if labels is None:
+        raise ValueError("`_fast_binary_cm` requires 1-d arrays of equal "
+                         "length containing only 0 and 1 labels.")
+
+    return _count_binary_cm(*labels)
+
+
+def _count_binary_cm(y_true, y_pred):
+    """
+    Counting step of `_fast_binary_cm`, for `np.uint8` inputs returned by 
+    `_binary_label_pair`.
+    """
+    if njit is not None and len(y_true) >= _NUMBA_MIN_SIZE:
+        return _cm_binary_numba(y_true, y_pred, get_num_threads())
+
+    return np.bincount((y_true << 1) | y_pred, minlength=4).reshape(2, 2)
+
+
+def _safe_divide(num, denom):
+    return num / denom if denom else 0.
+
+
+# score functions that can be computed straight from a binary confusion 
+# matrix, mapped to functions that do so (with sklearn's default arguments)
+_CM_SCORE_FUNCS = {
+    accuracy_score: lambda cm: _safe_divide(cm[0, 0] + cm[1, 1], cm.sum()),
+    precision_score: lambda cm: _safe_divide(cm[1, 1], cm[1, 1] + cm[0, 1]),
+    recall_score: lambda cm: _safe_divide(cm[1, 1], cm[1, 1] + cm[1, 0]),
+    f1_score: lambda cm: _safe_divide(2 * cm[1, 1],
+                                      2 * cm[1, 1] + cm[0, 1] + cm[1, 0]),
+}
+
+
+def _get_cm(score_funcs, y_true, y_pred):
+    """
+    Returns `_fast_binary_cm(y_true, y_pred)` if any of `score_funcs` can 
+    be computed from it and the labels are binary (1-d & 0/1 - so not 
+    e.g. multi-output targets), else `None`.
+    """
+    if not any(func in _CM_SCORE_FUNCS for func in score_funcs):
+        return None
+
+    labels = _binary_label_pair(y_true, y_pred)
+
+    if labels is None:
+        return None
+
+    return _count_binary_cm(*labels)
+
+
+def _apply_score_func(func, y_true, y_pred, cm=None):
+    """
+    Returns `func(y_true, y_pred)`, reading the score off of `cm` instead 
+    if it is passed and `func` can be computed from it.
+    """
+    if cm is not None and func in _CM_SCORE_FUNCS:
+        return _CM_SCORE_FUNCS[func](cm)
+
+    return func(y_true, y_pred)
+
+
+def _predict_test_only(model_obj, X_train, y_train, X_test):
+    """
+    Fits `model_obj` to training data and returns predictions for test data.
+    """
+    return model_obj.fit(X_train, y_train).predict(X_test)
+
+
+def _predict_both(model_obj, X_train, y_train, X_test):
+    """
+    Fits `model_obj` to training data and returns predictions for both 
+    training and test data.
+    """
+    model = model_obj.fit(X_train, y_train)
+    return model.predict(X_train), model.predict(X_test)
 
 
 def train_and_score(model_obj, score_funcs, X_train, y_train,
-                     X_test, y_test, train_scores=True):
+                     X_test, y_test, train_scores=False, cm_aware=True):
     """
     Trains model to training data, outputs score(test data) 
     for each score in "score_funcs", and does the same for 
-    train data unless "train_data" is set to False
+    train data if "train_scores" is set to True. Training data 
+    is only predicted on when "train_scores" is True.
+
+    If "cm_aware" is True and labels are binary, a confusion matrix 
+    is computed once per data set, and any of accuracy, precision, 
+    recall and F1 in "score_funcs" are read off of it instead of 
+    each re-counting the predictions.
     """
-    def apply_score_func(func):
-        if train_scores is True:
-            return (func(y_train, y_hat_train), func(y_test, y_hat_test))
-        else:
-            return func(y_test, y_hat_test)
+    if train_scores is True:
+        y_hat_train, y_hat_test = _predict_both(model_obj, X_train, y_train,
+                                                X_test)
 
-    model = model_obj.fit(X_train, y_train)
+        cm_train, cm_test = None, None
+        if cm_aware is True:
+            cm_train = _get_cm(score_funcs, y_train, y_hat_train)
+            cm_test = _get_cm(score_funcs, y_test, y_hat_test)
 
-    y_hat_train = model.predict(X_train)
-    y_hat_test = model.predict(X_test)
+        return [(_apply_score_func(func, y_train, y_hat_train, cm_train), 
+                 _apply_score_func(func, y_test, y_hat_test, cm_test))
+                for func in score_funcs]
 
-    return list(map(apply_score_func, score_funcs))
+    else:
+        y_hat_test = _predict_test_only(model_obj, X_train, y_train, X_test)
+
+        cm_test = None
+        if cm_aware is True:
+            cm_test = _get_cm(score_funcs, y_test, y_hat_test)
+
+        return [_apply_score_func(func, y_test, y_hat_test, cm_test)
+                for func in score_funcs]
+
+
+def _is_fortran(X):
+    return X.ndim == 2 and X.flags.f_contiguous and not X.flags.c_contiguous
+
+
+def _take_rows(X, idx, out=None):
+    """
+    Returns rows `idx` of array `X`, preserving the memory layout of `X` - 
+    i.e. rows taken from a Fortran-ordered `X` are themselves Fortran-ordered.
+
+    If passed, `out` (which must match `X` in layout) is filled and returned 
+    instead of allocating a new array. `idx` is assumed to be in bounds.
+    """
+    if _is_fortran(X):
+        if out is None:
+            return np.take(X.T, idx, axis=1).T
+
+        np.take(X.T, idx, axis=1, out=out.T, mode="clip")
+        return out
+
+    if out is None:
+        return np.take(X, idx, axis=0)
+
+    return np.take(X, idx, axis=0, out=out, mode="clip")
+
+
+def _fit_fold(model_obj, score_funcs, X, y, train, test, scale_obj=None,
+              train_scores=False, X_train_out=None, X_test_out=None):
+    """
+    Slices a single `(train, test)` fold out of the X & y arrays, scales it if 
+    `scale_obj` is passed, and hands it off to `train_and_score`. Works on 
+    copies of `model_obj` and `scale_obj`, so that folds running in parallel 
+    do not share fitted state.
+
+    `X_train_out` & `X_test_out` are optional preallocated buffers for the 
+    X slices (see `_take_rows`).
+    """
+    model_obj = deepcopy(model_obj)
+
+    y_train = y[train]
+    y_test = y[test]
+
+    X_train = _take_rows(X, train, out=X_train_out)
+    X_test = _take_rows(X, test, out=X_test_out)
+
+    if scale_obj is not None:
+        scale_obj = deepcopy(scale_obj)
+        X_train = scale_obj.fit_transform(X_train)
+        X_test = scale_obj.transform(X_test)
+
+    return train_and_score(model_obj, score_funcs, 
+                           X_train, y_train,
+                           X_test, y_test,
+                           train_scores)
+
+
+def _get_cross_validator(model_obj, splits=5, random_state=0,
+                         cross_validator_obj=None):
+    """
+    Returns `cross_validator_obj` if passed, else a shuffling 
+    `StratifiedKFold` or `KFold`, depending on whether `model_obj` 
+    is a classifier or a regressor.
+    """
+    if cross_validator_obj is not None:
+        return cross_validator_obj
+
+    elif model_obj._estimator_type == "classifier":
+        return StratifiedKFold(n_splits=splits, shuffle=True,
+                               random_state=random_state)
+
+    elif model_obj._estimator_type == "regressor":
+        return KFold(n_splits=splits, shuffle=True, random_state=random_state)
+
+    else:
+        raise TypeError("Improper model type.")
+
+
+def _to_arrays(X, y):
+    """
+    Converts X to a Fortran-ordered array and y to an array (see `cv_engine`).
+    """
+    X_arr = X.to_numpy() if hasattr(X, "to_numpy") else np.asarray(X)
+    return np.asfortranarray(X_arr), np.asarray(y)
+
+
+def _prepare_folds(X, y, cross_validator_obj, scale_obj=None):
+    """
+    Splits X & y with `cross_validator_obj` and returns `list` of 
+    `(X_train, y_train, X_test, y_test)` arrays, one per fold. If 
+    `scale_obj` is passed, a copy of it is fit to each train fold and 
+    applied to the matching test fold.
+
+    The folds can then be passed to `cv_engine_prepared` any number of 
+    times, so that splitting and scaling are done only once.
+    """
+    X_arr, y_arr = _to_arrays(X, y)
+
+    folds = []
+    for train, test in cross_validator_obj.split(X_arr, y_arr):
+        X_train = _take_rows(X_arr, train)
+        X_test = _take_rows(X_arr, test)
+
+        if scale_obj is not None:
+            fold_scaler = deepcopy(scale_obj)
+            X_train = fold_scaler.fit_transform(X_train)
+            X_test = fold_scaler.transform(X_test)
+
+        folds.append((X_train, y_arr[train], X_test, y_arr[test]))
+
+    return folds
 
 
 def cv_engine(X, y, model_obj, score_funcs, splits=5, scale_obj=None, 
-              train_scores=True, random_state=0, cross_validator_obj=None):
+              train_scores=False, random_state=0, cross_validator_obj=None,
+              n_jobs=None):
     """
     Splits data (based on whether model is classifier
     or regressor) and passes each fold to the `train_and_score`
@@ -37,11 +331,18 @@ def cv_engine(X, y, model_obj, score_funcs, splits=5, scale_obj=None,
 
     Collects results and returns results as `list`.
 
+    X and y are converted to NumPy arrays before splitting, so `model_obj`, 
+    `scale_obj` and `score_funcs` all receive arrays rather than pandas 
+    objects.
+
     parameters
     ----------
 
     X: pd.DataFrame
-        Exogenous variables to be used as model inputs.
+        Exogenous variables to be used as model inputs. X is copied into a 
+        Fortran-ordered (column-major) array before splitting, and each fold 
+        keeps that layout, so that the column-wise operations performed by 
+        most scikit-learn scalers and estimators read contiguous memory.
 
     y: pd.Series
         Endogenous variable that should be predicted by the model.
@@ -64,13 +365,14 @@ def cv_engine(X, y, model_obj, score_funcs, splits=5, scale_obj=None,
         Should be a scikit-learn transform object (i.e. inherits from 
         `sklearn.BaseEstimator` and `sklearn.TransformerMixin`) or have 
         a similar API (i.e. `scale_obj.fit_transform()` works as expected). 
-        If passed, X will be scaled within each fold so as to prevent data 
-        leakage. 
+        If passed, X will be scaled within each fold (fit on train, applied 
+        to test) so as to prevent data leakage. 
 
-    train_scores: bool (default=True)
+    train_scores: bool (default=False)
         Determines whether training scores, in addition to test scores, are 
         returned. Train scores are useful for comparing to test scores in order 
-        to assess model fit.
+        to assess model fit, but require predicting on the training data of 
+        every fold, which roughly doubles prediction time.
 
     `random_state`: int, RandomState instance or None (default=0)
         Set the seed used for random sampling in cross-validation, which allows 
@@ -81,73 +383,82 @@ def cv_engine(X, y, model_obj, score_funcs, splits=5, scale_obj=None,
         Can pass a cross-validator to override defaul CV behavior (e.g. when
         geting results for a learning curve).
 
+    `n_jobs`: int or None (default=None)
+        Number of folds to fit in parallel, passed through to 
+        `joblib.Parallel`. `None` means 1 unless in a `joblib.parallel_config` 
+        context, and -1 means use all processors.
+
     return
     ------
 
     `list` of `train_and_score` results, with length `splits`.
 
     """
-    if cross_validator_obj is not None:
-        skf = cross_validator_obj
-
-    elif model_obj._estimator_type == "classifier":
-        skf = StratifiedKFold(n_splits=splits, shuffle=True,
-                              random_state=random_state)
+    skf = _get_cross_validator(model_obj, splits, random_state,
+                               cross_validator_obj)
+
+    # convert to arrays once, so folds are sliced without pandas indexing
+    X_arr, y_arr = _to_arrays(X, y)
+
+    splits_iter = list(skf.split(X_arr, y_arr))
+
+    # when folds run serially, X slices are taken into buffers that are 
+    # reused across folds of the same size, rather than reallocated per fold
+    train_bufs, test_bufs = {}, {}
+    if effective_n_jobs(n_jobs) == 1 and X_arr.ndim == 2:
+        order = "F" if _is_fortran(X_arr) else "C"
+        for train, test in splits_iter:
+            for bufs, idx in ((train_bufs, train), (test_bufs, test)):
+                if len(idx) not in bufs:
+                    bufs[len(idx)] = np.empty((len(idx), X_arr.shape[1]),
+                                              dtype=X_arr.dtype, order=order)
+
+    results = Parallel(n_jobs=n_jobs, backend="loky")(
+                    delayed(_fit_fold)(
+                        model_obj, score_funcs, 
+                        X_arr, y_arr, train, test, 
+                        scale_obj, train_scores,
+                        train_bufs.get(len(train)), test_bufs.get(len(test))
+                    ) for train, test in splits_iter)
 
-    elif model_obj._estimator_type == "regressor":
-        skf = KFold(n_splits=splits, suffle=True, random_state=random_state)
-
-    else:
-        raise TypeError("Improper model type.")
-
-    results = []
-    for train, test in skf.split(X, y):
-        y_train = y.iloc[train]
-        y_test = y.iloc[test]
+    return results
 
-        X_train = X.iloc[train, :]
-        X_test = X.iloc[test, :]
 
-        if scale_obj is not None:
-            X_train = scale_obj.fit_transform(X_train)
-            X_test = scale_obj.fit_transform(X_test)
+def cv_engine_prepared(folds, model_obj, score_funcs, train_scores=False,
+                       n_jobs=None):
+    """
+    Same as `cv_engine`, but for folds that have already been split (and 
+    scaled) by `_prepare_folds`, so that they can be shared across several 
+    models - e.g. across a hyper-parameter range.
 
-        results.append(
-            train_and_score(
-                    model_obj, score_funcs, 
-                    X_train, y_train,
-                    X_test, y_test,
-                    train_scores
-                ))
+    Please see `validation.cv_engine` for details on other args.
+    """
+    results = Parallel(n_jobs=n_jobs, backend="loky")(
+                    delayed(train_and_score)(
+                        deepcopy(model_obj), score_funcs, 
+                        X_train, y_train, 
+                        X_test, y_test, 
+                        train_scores
+                    ) for X_train, y_train, X_test, y_test in folds)
 
     return results
 
 
-def format_cv_results(results, score_funcs, train_scores=True):
+def format_cv_results(results, score_funcs, train_scores=False):
     """
     Takes results from cv_engine and returns as 
     unaggregated DataFrame, where trial number & score 
     function used are represented in index.
     """
+    arr = np.asarray(results, dtype=float)
+    names = [score.__name__ for score in score_funcs]
+
     if train_scores is False:
-        cols = [score.__name__ for score in score_funcs]
-        return pd.DataFrame(res, columns=cols)
+        return pd.DataFrame(arr, columns=names)
 
     else:
-        res = np.array([tuple(chain(*trial)) for trial in results])
-        dfs = []
-
-        for i in range(0, res.shape[1], 2):
-            dfs.append(
-                pd.concat(
-                    {
-                    score_funcs[i // 2].__name__: 
-                        pd.DataFrame(res[:, i:i+2], columns=["train", "test"])
-                        },
-                    axis=1
-                    ))
-
-        return dfs[0].join(dfs[1:])
+        cols = pd.MultiIndex.from_product([names, ["train", "test"]])
+        return pd.DataFrame(arr.reshape(arr.shape[0], -1), columns=cols)
 
 
 def describe_dataframe(results, stats_to_run=["mean", "std"]):
@@ -174,17 +485,11 @@ def describe_dataframe(results, stats_to_run=["mean", "std"]):
     if isinstance(stats_to_run, str):
         stats_to_run = [stats_to_run]
 
-    get_stats = lambda func_name: getattr(results, func_name)(
-                                         ).rename(func_name
-                                         ).to_frame()
-
-    to_return = [get_stats(s) for s in stats_to_run]
-
-    return to_return[0].join(to_return[1:])
+    return results.agg(stats_to_run).T
 
 
 def cv_score(X, y, model_obj, score_funcs, stats_to_run=["mean", "std"],
-            train_scores=True, **cv_engine_kwargs):
+            train_scores=False, n_jobs=None, **cv_engine_kwargs):
     """
     Cross-validates passed model and returns performance statistics. 
     Cross-validiation is performed using shuffling. If passed model is a 
@@ -216,10 +521,14 @@ def cv_score(X, y, model_obj, score_funcs, stats_to_run=["mean", "std"],
         pandas.DataFrame method name(s) indicating statistic to be run,
         e.g. "mean" or `["mad", "var"]`.
 
-    train_scores: bool (default=True)
+    train_scores: bool (default=False)
         Determines whether training scores, in addition to test scores, are 
         returned. Train scores are useful for comparing to test scores in order 
-        to assess model fit.
+        to assess model fit, but require predicting on the training data of 
+        every fold, which roughly doubles prediction time.
+
+    n_jobs: int or None (default=None)
+        Number of folds to fit in parallel. See `cv_engine`.
 
     See `cv_engine` for more information on additional kwargs.
 
@@ -235,36 +544,53 @@ def cv_score(X, y, model_obj, score_funcs, stats_to_run=["mean", "std"],
     return describe_dataframe(
                 format_cv_results(
                     cv_engine(
-                        X, y, model_obj, score_funcs, **cv_engine_kwargs
+                        X, y, model_obj, score_funcs, 
+                        train_scores=train_scores, n_jobs=n_jobs,
+                        **cv_engine_kwargs
                         ), 
                     score_funcs, train_scores))
 
 
 def cv_conf_mat(X, y, model_obj, **cv_engine_kwargs):
     """
-    Return confusion matrix for each CV trial.
+    Return confusion matrix for each CV trial. Negative & positive 
+    classes are the lower & higher of the two labels in `y`, in sorted 
+    order (as in `sklearn.metrics.confusion_matrix`). Only binary 
+    classification is supported: raises `ValueError` unless `y` holds 
+    exactly two labels.
 
     See `cv_engine` for more information on additional kwargs.
     """
+    labels = np.unique(np.asarray(y))
+
+    if len(labels) != 2:
+        raise ValueError("`cv_conf_mat` supports binary classification only, "
+                         f"but `y` has {len(labels)} labels: {list(labels)}.")
+
+    # `_fast_binary_cm` only counts 0/1 labels
+    if np.isin(labels, (0, 1)).all():
+        conf_mat = _fast_binary_cm
+    else:
+        conf_mat = partial(confusion_matrix, labels=labels)
+
     results = cv_engine(X=X, y=y, model_obj=model_obj, 
-                        score_funcs=[confusion_matrix],
+                        score_funcs=[conf_mat],
                         train_scores=False,
                         **cv_engine_kwargs)
 
-    results = [pd.concat(
-                {
-                    i: pd.DataFrame(trial[0],
-                                    index=["neg_true", "pos_true"],
-                                    columns=["neg_pred", "pos_pred"])
-                }
-               ) for i, trial in enumerate(results, 1)]
+    arr = np.stack([trial[0] for trial in results])
 
-    return pd.concat(results)
+    idx = pd.MultiIndex.from_product([range(1, len(results) + 1),
+                                      ["neg_true", "pos_true"]])
+
+    return pd.DataFrame(arr.reshape(-1, 2), index=idx,
+                        columns=["neg_pred", "pos_pred"])
 
 
 def validate_param_range(X, y, model_type, param_name, param_range,
                          score_funcs, other_params={}, train_scores=True,
-                         **cv_engine_kwargs):
+                         splits=5, scale_obj=None, random_state=0,
+                         cross_validator_obj=None, n_jobs=None):
     """
     Returns `validation.cv_score` across values in `param_range`
     for `param_name`, which should be a working parameter for the
@@ -275,23 +601,33 @@ def validate_param_range(X, y, model_type, param_name, param_range,
     hyper-parameters (i.e. not `param_name` should be passed
     in to `other_params` as dictionary.
 
+    Data is split (and scaled, if `scale_obj` is passed) only once, 
+    and the same folds are used for every value in `param_range`. 
+    `n_jobs` sets how many values are cross-validated in parallel 
+    (see `joblib.Parallel`).
+
     Please see `validation.cv_engine` for details on other args.
     """ 
-    results = {}
-    for val in param_range:
-        model_obj = model_type(**{param_name: val}, **other_params)
+    models = [model_type(**{param_name: val}, **other_params)
+              for val in param_range]
 
-        some_kwargs = {"model_obj": model_obj, "X": X, "y": y, 
-                       **cv_engine_kwargs}
+    skf = _get_cross_validator(models[0], splits, random_state,
+                               cross_validator_obj)
+    folds = _prepare_folds(X, y, skf, scale_obj)
 
-        other_kwargs = {"train_scores": train_scores,
-                        "score_funcs": score_funcs}
+    all_res = Parallel(n_jobs=n_jobs)(
+                    delayed(cv_engine_prepared)(
+                        folds, model_obj, score_funcs,
+                        train_scores=train_scores
+                    ) for model_obj in models)
 
-        if isinstance(val, collections.Iterable):
+    results = {}
+    for val, res in zip(param_range, all_res):
+        if isinstance(val, (list, tuple, np.ndarray, Iterable)) \
+                and not isinstance(val, str):
             val = str(val)
 
-        res = cv_engine(**some_kwargs, **other_kwargs)
-        results[val] = format_cv_results(res, **other_kwargs)
+        results[val] = format_cv_results(res, score_funcs, train_scores)
 
     to_return = pd.concat(results)
     to_return.index = to_return.index.rename(param_name, level=0)
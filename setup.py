@@ -8,6 +8,7 @@ setup(
     url="https://github.com/lermana/indoorplants",
     packages=find_packages(),
     install_requires=["numpy",
+                      "joblib",
                       "scipy",
                       "pandas",
                       "sklearn",
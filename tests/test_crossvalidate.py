@@ -1,7 +1,10 @@
 import unittest
-import collections
+from collections.abc import Iterable
 import numpy as np
 import pandas as pd
+from sklearn.preprocessing import StandardScaler
+from sklearn.metrics import confusion_matrix, accuracy_score, \
+                            precision_score, recall_score, f1_score
 
 from indoorplants.validation import crossvalidate
 
@@ -45,7 +48,7 @@ class ClassifierStub(ModelStubBase):
         self.y_fit_shape = y.shape
 
         if len(self.y_fit_shape) == 1:
-            self.num_classes = y.nunique()
+            self.num_classes = len(np.unique(y))
         else:
             self.num_classes = self.y_fit_shape[1]
         
@@ -58,10 +61,23 @@ class ClassifierStub(ModelStubBase):
         return np.zeros((X.shape[0], self.num_classes))
 
 
+class ScalerStub:
+
+    def fit(self, X, y=None):
+        self.mean = X.mean(axis=0)
+        return self
+
+    def transform(self, X):
+        return X - self.mean
+
+    def fit_transform(self, X, y=None):
+        return self.fit(X, y).transform(X)
+
+
 def get_dummy_x_y():
     X = pd.DataFrame(np.zeros((100, 10)))
-    y = pd.Series(np.zeros(50)
-                  ).append(pd.Series(np.ones(50)))
+    y = pd.concat([pd.Series(np.zeros(50)), pd.Series(np.ones(50))],
+                  ignore_index=True)
     return X, y
 
 
@@ -69,6 +85,10 @@ def dummy_score_func(y_true, y_pred):
     return np.mean(y_true) - np.mean(y_pred)
 
 
+def position_score_func(y_true, y_pred):
+    return float(np.dot(y_true, np.arange(len(y_true))))
+
+
 class TestCrossvalidate(unittest.TestCase):
 
     def test_train_and_score(self):
@@ -109,7 +129,7 @@ class TestCrossvalidate(unittest.TestCase):
                                                 train_scores=False)
 
         self.assertEqual(len(score_funcs), len(results))
-        self.assertTrue(all(map(lambda row: not isinstance(row, collections.Iterable), results)))
+        self.assertTrue(all(map(lambda row: not isinstance(row, Iterable), results)))
 
         self.assertTrue(model_obj.fit_called)
         self.assertEqual(model_obj.X_fit_shape[0], model_obj.y_fit_shape[0])
@@ -119,6 +139,256 @@ class TestCrossvalidate(unittest.TestCase):
         self.assertEqual(model_obj.X_fit_shape[1], model_obj.X_predict_shape[1])
         self.assertEqual(model_obj.num_classes, 2)
 
+    def test_fast_binary_cm(self):
+
+        rng = np.random.RandomState(0)
+        y_true = rng.randint(0, 2, 100)
+        y_pred = rng.randint(0, 2, 100)
+
+        np.testing.assert_array_equal(
+                        crossvalidate._fast_binary_cm(y_true, y_pred),
+                        confusion_matrix(y_true, y_pred))
+
+        # all four cells are returned even if only one class is present
+        np.testing.assert_array_equal(
+                        crossvalidate._fast_binary_cm(np.ones(10), np.ones(10)),
+                        np.array([[0, 0], [0, 10]]))
+
+    def test_fast_binary_cm_invalid(self):
+
+        # large enough to take the numba path, if numba is installed
+        n = crossvalidate._NUMBA_MIN_SIZE * 2
+        ones = np.ones(n, dtype=int)
+
+        for y_true, y_pred in ((ones + 1, ones),
+                               (ones, ones - 2),
+                               (ones, ones[:-1]),
+                               (ones * .5, ones),
+                               (ones * np.nan, ones),
+                               (np.ones((n, 2)), np.ones((n, 2)))):
+            with self.assertRaises(ValueError):
+                crossvalidate._fast_binary_cm(y_true, y_pred)
+
+    @unittest.skipUnless(crossvalidate.njit is not None, "numba not installed")
+    def test_cm_binary_numba(self):
+
+        rng = np.random.RandomState(0)
+
+        empty = np.array([], dtype=np.uint8)
+        np.testing.assert_array_equal(
+                crossvalidate._cm_binary_numba(empty, empty, 4), np.zeros((2, 2)))
+
+        for n in (1, 7, 1001):
+            y_true = rng.randint(0, 2, n).astype(np.uint8)
+            y_pred = rng.randint(0, 2, n).astype(np.uint8)
+
+            for n_chunks in (1, 4):
+                np.testing.assert_array_equal(
+                        crossvalidate._cm_binary_numba(y_true, y_pred, n_chunks),
+                        confusion_matrix(y_true, y_pred, labels=[0, 1]))
+
+    def test_cv_score_keeps_label_dtype(self):
+
+        class AllPositiveStub(ClassifierStub):
+
+            def fit(self, X, y):
+                self.y_dtype = y.dtype
+                return super().fit(X, y)
+
+            def predict(self, X):
+                return np.ones(X.shape[0], dtype=self.y_dtype)
+
+        def mean_abs_error(y_true, y_pred):
+            return np.mean(np.abs(y_true - y_pred))
+
+        X, _ = get_dummy_x_y()
+        y = pd.Series(np.repeat([0, 1], 50))
+
+        results = crossvalidate.cv_score(X, y, AllPositiveStub(), 
+                                         mean_abs_error, splits=5)
+
+        # half of each stratified test fold is negative, so the score is 0.5 
+        # unless labels are passed in a dtype that wraps around on subtraction
+        self.assertAlmostEqual(results.loc["mean_abs_error", "mean"], 0.5)
+
+    def test_train_and_score_cm_aware(self):
+
+        rng = np.random.RandomState(0)
+        X = pd.DataFrame(rng.rand(100, 10))
+        y = pd.Series(rng.randint(0, 2, 100))
+
+        score_funcs = [accuracy_score, precision_score, recall_score, 
+                       f1_score, dummy_score_func]
+
+        results = [crossvalidate.train_and_score(ClassifierStub(), score_funcs,
+                                                 X, y, X, y, 
+                                                 train_scores=True,
+                                                 cm_aware=cm_aware)
+                   for cm_aware in (True, False)]
+
+        np.testing.assert_allclose(results[0], results[1])
+
+        # multi-output 0/1 targets are scored by `accuracy_score` itself
+        y_multi = pd.DataFrame(rng.randint(0, 2, (100, 2)))
+
+        results = crossvalidate.train_and_score(ClassifierStub(), 
+                                                [accuracy_score],
+                                                X, y_multi, X, y_multi,
+                                                train_scores=True)
+
+        expected = accuracy_score(y_multi, np.zeros(y_multi.shape))
+        np.testing.assert_allclose(results, [(expected, expected)])
+
+    def test_cv_score_scale_obj(self):
+
+        X, y = get_dummy_x_y()
+
+        for model_type in (ClassifierStub, RegressorStub):
+            for scale_obj in (StandardScaler(), ScalerStub()):
+                results = crossvalidate.cv_score(X, y, model_type(), 
+                                                 [dummy_score_func], splits=4,
+                                                 scale_obj=scale_obj)
+
+                self.assertEqual(list(results.index), ["dummy_score_func"])
+
+    def test_cv_score_regressor(self):
+
+        X, y = get_dummy_x_y()
+
+        results = crossvalidate.cv_score(X, y, RegressorStub(), 
+                                         dummy_score_func, splits=5)
+
+        self.assertEqual(list(results.index), ["dummy_score_func"])
+        self.assertEqual(list(results.columns), ["mean", "std"])
+
+        results = crossvalidate.cv_score(X, y, RegressorStub(), 
+                                         dummy_score_func, splits=5,
+                                         train_scores=True)
+
+        self.assertEqual(list(results.index), 
+                         [("dummy_score_func", "train"), 
+                          ("dummy_score_func", "test")])
+
+    def test_format_cv_results(self):
+
+        score_funcs = [dummy_score_func, accuracy_score]
+
+        # with `train_scores=True`
+
+        results = [[(1., 2.), (3., 4.)], [(5., 6.), (7., 8.)]]
+        df = crossvalidate.format_cv_results(results, score_funcs, 
+                                             train_scores=True)
+
+        self.assertEqual(list(df.columns), 
+                         [("dummy_score_func", "train"), 
+                          ("dummy_score_func", "test"),
+                          ("accuracy_score", "train"), 
+                          ("accuracy_score", "test")])
+        np.testing.assert_array_equal(df.values, [[1, 2, 3, 4], [5, 6, 7, 8]])
+
+        # with `train_scores=False`
+
+        results = [[1., 2.], [3., 4.]]
+        df = crossvalidate.format_cv_results(results, score_funcs, 
+                                             train_scores=False)
+
+        self.assertEqual(list(df.columns), 
+                         ["dummy_score_func", "accuracy_score"])
+        np.testing.assert_array_equal(df.values, [[1, 2], [3, 4]])
+
+    def test_cv_engine_shuffle(self):
+
+        rng = np.random.RandomState(0)
+        X = pd.DataFrame(rng.rand(100, 10))
+        y = pd.Series(rng.randint(0, 2, 100))
+
+        run = lambda model_obj, **kwargs: crossvalidate.cv_engine(
+                                                X, y, model_obj, 
+                                                [position_score_func],
+                                                train_scores=False, **kwargs)
+
+        for model_type in (ClassifierStub, RegressorStub):
+
+            # folds are shuffled according to `random_state`
+            self.assertNotEqual(run(model_type(), random_state=0),
+                                run(model_type(), random_state=1))
+
+            # and are reproducible when run in parallel
+            self.assertEqual(run(model_type(), random_state=0),
+                             run(model_type(), random_state=0, n_jobs=2))
+
+    def test_validate_param_range(self):
+
+        X, y = get_dummy_x_y()
+        param_range = [(1, 2), (3, 4), (5, 6)]
+
+        results = crossvalidate.validate_param_range(X, y, RegressorStub, 
+                                                     "alpha", param_range,
+                                                     [dummy_score_func],
+                                                     splits=4)
+
+        self.assertEqual(results.index.names[0], "alpha")
+        self.assertEqual(list(results.index.levels[0]), 
+                         sorted(map(str, param_range)))
+        self.assertEqual(results.shape, (len(param_range) * 4, 2))
+
+        # with a scaler that isn't a scikit-learn estimator
+        results = crossvalidate.validate_param_range(X, y, RegressorStub, 
+                                                     "alpha", param_range,
+                                                     [dummy_score_func],
+                                                     splits=4, 
+                                                     scale_obj=ScalerStub())
+
+        self.assertEqual(results.shape, (len(param_range) * 4, 2))
+
+    def test_cv_conf_mat(self):
+
+        X, y = get_dummy_x_y()
+
+        class AllNegativeStub(ClassifierStub):
+
+            def predict(self, X):
+                return np.zeros(X.shape[0])
+
+        results = crossvalidate.cv_conf_mat(X, y, AllNegativeStub(), splits=4)
+
+        self.assertEqual(list(results.columns), ["neg_pred", "pos_pred"])
+        self.assertEqual(list(results.index)[:2], 
+                         [(1, "neg_true"), (1, "pos_true")])
+        self.assertEqual(results.shape, (8, 2))
+
+        self.assertEqual(results["neg_pred"].sum(), len(y))
+        self.assertEqual(results["pos_pred"].sum(), 0)
+
+    def test_cv_conf_mat_labels(self):
+
+        class ThresholdStub(ClassifierStub):
+
+            def fit(self, X, y):
+                self.classes_ = np.unique(y)
+                return super().fit(X, y)
+
+            def predict(self, X):
+                return np.where(X[:, 0] > .5, self.classes_[1], self.classes_[0])
+
+        rng = np.random.RandomState(0)
+        X = pd.DataFrame(rng.rand(100, 3))
+        y = pd.Series(rng.randint(0, 2, 100))
+
+        expected = crossvalidate.cv_conf_mat(X, y, ThresholdStub(), splits=4)
+
+        # lower label is treated as negative, higher as positive
+        for neg, pos in ((1, 2), (-1, 1), ("a", "b"), (False, True)):
+            results = crossvalidate.cv_conf_mat(X, y.map({0: neg, 1: pos}), 
+                                                ThresholdStub(), splits=4)
+            pd.testing.assert_frame_equal(results, expected, check_dtype=False)
+
+        # anything other than two labels is rejected up front
+        for y_bad in (y.mask(y.index < 10, 2), pd.Series(np.zeros(100)), 
+                      y.map({0: "a", 1: "b"}).mask(y.index < 10, "c")):
+            with self.assertRaisesRegex(ValueError, "binary"):
+                crossvalidate.cv_conf_mat(X, y_bad, ThresholdStub(), splits=4)
+
     def test_cv_engine(self):
 
         # get dummy functionality and data